@@ -1,40 +1,211 @@
 # Campaign ID Generator
 # A Streamlit application to generate and track marketing campaign IDs based on targeting criteria
-# Dependencies: streamlit, pandas
+# Dependencies: streamlit, pyarrow (optional: orjson for faster JSON export)
 
 import streamlit as st
-import pandas as pd
 import hashlib
-import uuid
 import datetime
 import json
-from typing import Dict, List, Any
+import csv
+import atexit
+import gc
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Iterator, List, Any, Optional, Tuple
 
-def generate_campaign_id(campaign_data: Dict[str, Any]) -> str:
-    """Generate a unique campaign ID based on targeting criteria and timestamp."""
-    # Create a base string with timestamp for uniqueness
-    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-    
-    # Create a shortened hash of the campaign data
-    data_string = json.dumps(campaign_data, sort_keys=True)
-    hash_object = hashlib.md5(data_string.encode())
-    data_hash = hash_object.hexdigest()[:8]
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+HISTORY_FILE = "campaign_records.csv"
+HISTORY_FIELDS = (
+    "campaign_id", "creation_date", "created_by", "platform", "campaign_objective",
+    "targeting_criteria", "budget", "start_date", "end_date"
+)
+# Number of records buffered before they are written to HISTORY_FILE
+PENDING_BATCH_SIZE = 16
+# Columns shown in the sidebar history
+HISTORY_COLUMNS = ["campaign_id", "creation_date", "platform", "campaign_objective"]
+
+# Widget options, built once rather than on every rerun
+PLATFORMS = ("Facebook", "Instagram", "Google Ads", "TikTok", "LinkedIn", "Twitter", "YouTube", "Other")
+OBJECTIVES = (
+    "Brand Awareness", "Reach", "Traffic", "Engagement", "App Installs",
+    "Video Views", "Lead Generation", "Messages", "Conversions", "Catalog Sales"
+)
+GENDERS = ("Male", "Female", "All")
+LANGUAGES = ("English", "Spanish", "French", "German", "Chinese", "Japanese", "Other")
+LOCATION_TYPES = ("Countries", "Regions", "Cities", "Radius", "Custom")
+INTERESTS = (
+    "Technology", "Fashion", "Sports", "Gaming", "Travel", "Food & Drink",
+    "Entertainment", "Business", "Fitness", "Education", "Family", "Music"
+)
+BEHAVIORS = (
+    "Frequent Travelers", "Online Shoppers", "Mobile Device Users",
+    "International", "Early Technology Adopters", "Small Business Owners"
+)
+DEVICES = ("Desktop", "Mobile", "Tablet", "All")
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_history(mtime: float) -> "pa.Table":
+    """Load the sidebar columns of the history CSV, cached until its mtime changes.
+
+    The table is shared between reruns rather than copied on each hit.
+    """
+    # Imported here so reruns without a history file never pay for them
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+
+    # Decode only the displayed columns; the repetitive ones become categoricals
+    category = pa.dictionary(pa.int32(), pa.string())
+    table = pacsv.read_csv(
+        HISTORY_FILE,
+        convert_options=pacsv.ConvertOptions(
+            include_columns=HISTORY_COLUMNS,
+            column_types={
+                "campaign_id": pa.string(),
+                "creation_date": pa.string(),
+                "platform": category,
+                "campaign_objective": category,
+            },
+        ),
+    )
+    return table
+
+def search_history(table: "pa.Table", search_term: str) -> "pa.Table":
+    """Return the history rows whose ID or platform contains the search term."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # Literal, case-insensitive substring scans in Arrow's kernels, OR'ed as bitmaps
+    mask = pc.or_kleene(
+        pc.match_substring(table["campaign_id"], search_term, ignore_case=True),
+        pc.match_substring(pc.cast(table["platform"], pa.string()), search_term, ignore_case=True),
+    )
+    return table.filter(mask)
+
+@st.cache_resource
+def get_writer():
+    """Open a shared append handle on the campaign history CSV."""
+    f = open(HISTORY_FILE, "a", newline="")
+    writer = csv.writer(f, lineterminator="\n")
+    # Append mode starts at the end, so position 0 means a missing or empty file
+    if f.tell() == 0:
+        writer.writerow(HISTORY_FIELDS)
+        f.flush()
+    return writer, f
+
+def get_history_writer():
+    """Return the shared append handle, reopening it if the file was replaced."""
+    writer, f = get_writer()
+    try:
+        stale = os.fstat(f.fileno()).st_ino != os.stat(HISTORY_FILE).st_ino
+    except FileNotFoundError:
+        stale = True
+    if stale:
+        # The file was deleted or swapped out (e.g. by git), so writes would be lost
+        f.close()
+        get_writer.clear()
+        writer, f = get_writer()
+    return writer, f
+
+@st.cache_resource
+def get_pending() -> Tuple[List[List[Any]], threading.RLock]:
+    """Create the shared buffer of unsaved records and its lock, flushed on shutdown.
+
+    The buffer lives in the resource cache because Streamlit re-executes this
+    module on every rerun. Clearing that cache (e.g. via the "Clear cache"
+    menu) starts a new, empty buffer. Records already in the old buffer are
+    then written only at process exit and no longer counted in the sidebar.
+    """
+    pending = []
+    lock = threading.RLock()
+    atexit.register(flush_pending, pending, lock)
+    return pending, lock
+
+def flush_pending(pending: List[List[Any]], lock: threading.RLock) -> None:
+    """Write all buffered records to the CSV file in one batch."""
+    # Sessions rerun on separate threads, so the swap and the write share one lock
+    with lock:
+        if not pending:
+            return
+        records = pending[:]
+        pending.clear()
+        writer, f = get_history_writer()
+        writer.writerows(records)
+        f.flush()
+    load_history.clear()
+
+def validate_campaign_data(campaign_data: Dict[str, Any]) -> List[str]:
+    """Return the names of required fields missing from the campaign data."""
+    errors = []
+    if not campaign_data.get("created_by"):
+        errors.append("Marketing Manager name")
+    if not campaign_data.get("platform"):
+        errors.append("Platform")
+    return errors
+
+def _flatten(data: Dict[str, Any], prefix: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    """Yield (key path, value) pairs for nested campaign data, with lists as tuples."""
+    for key, value in data.items():
+        path = prefix + (key,)
+        if isinstance(value, dict):
+            yield from _flatten(value, path)
+        elif isinstance(value, list):
+            yield path, tuple(value)
+        else:
+            yield path, value
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _fingerprint(frozen_items: Tuple[Tuple[Tuple[str, ...], Any], ...]) -> Tuple[str, str, str]:
+    """Return the platform code, objective code and data hash for flattened campaign data."""
+    # Create a shortened hash of the campaign data, fed field by field
+    hash_object = hashlib.blake2b(digest_size=4)
+    for path, value in frozen_items:
+        hash_object.update(repr(path).encode())
+        hash_object.update(repr(value).encode())
+    data_hash = hash_object.hexdigest()
     
     # Combine elements to create campaign ID
-    platform_code = campaign_data.get("platform", "ALL")[:3].upper()
-    objective_code = campaign_data.get("campaign_objective", "GEN")[:3].upper()
+    fields = dict(frozen_items)
+    platform_code = fields.get(("platform",), "ALL")[:3].upper()
+    objective_code = fields.get(("campaign_objective",), "GEN")[:3].upper()
+    
+    return platform_code, objective_code, data_hash
+
+def generate_campaign_id(
+    campaign_data: Dict[str, Any], now: Optional[datetime.datetime] = None
+) -> Tuple[str, str]:
+    """Generate a unique campaign ID based on targeting criteria and timestamp.
+
+    Returns the campaign ID together with its formatted creation date.
+    """
+    # Create a base string with timestamp for uniqueness
+    if now is None:
+        now = datetime.datetime.now()
+    timestamp = now.strftime("%Y%m%d%H%M%S")
+    creation_date = now.strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Hash and codes depend only on the inputs, so repeat submits hit the
+    # Streamlit cache, which unlike a module-level memo survives reruns
+    frozen_items = tuple(sorted(_flatten(campaign_data)))
+    platform_code, objective_code, data_hash = _fingerprint(frozen_items)
     
     # Create the final campaign ID
     campaign_id = f"{platform_code}-{objective_code}-{timestamp}-{data_hash}"
     
-    return campaign_id
+    return campaign_id, creation_date
 
-def save_campaign_data(campaign_data: Dict[str, Any], campaign_id: str) -> None:
+def save_campaign_data(campaign_data: Dict[str, Any], campaign_id: str, creation_date: str) -> None:
     """Save campaign data to a CSV file."""
     # Create a record to save
     record = {
         "campaign_id": campaign_id,
-        "creation_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "creation_date": creation_date,
         "created_by": campaign_data.get("created_by", "Unknown"),
         "platform": campaign_data.get("platform", ""),
         "campaign_objective": campaign_data.get("campaign_objective", ""),
@@ -44,18 +215,26 @@ def save_campaign_data(campaign_data: Dict[str, Any], campaign_id: str) -> None:
         "end_date": campaign_data.get("end_date", "")
     }
     
-    # Load existing data if file exists
-    try:
-        df = pd.read_csv("campaign_records.csv")
-        df = pd.concat([df, pd.DataFrame([record])], ignore_index=True)
-    except:
-        df = pd.DataFrame([record])
-    
-    # Save updated dataframe
-    df.to_csv("campaign_records.csv", index=False)
+    # Buffer the record and write once a full batch has accumulated
+    pending, lock = get_pending()
+    with lock:
+        pending.append([record[field] for field in HISTORY_FIELDS])
+        if len(pending) >= PENDING_BATCH_SIZE:
+            flush_pending(pending, lock)
 
-def main():
-    """Main application function"""
+def export_campaign_json(campaign_data: Dict[str, Any]) -> bytes:
+    """Serialize campaign data to compact JSON bytes for download."""
+    if orjson is not None:
+        return orjson.dumps(campaign_data)
+    return json.dumps(campaign_data, separators=(",", ":")).encode()
+
+@st.cache_resource(show_spinner=False)
+def get_render_gc_state() -> Dict[str, Any]:
+    """Create the process-wide count of in-progress renders that keeps GC disabled."""
+    return {"lock": threading.Lock(), "active": 0}
+
+def render_app():
+    """Render the application layout and handle submissions"""
     st.set_page_config(
         page_title="Campaign ID Generator",
         page_icon="🎯",
@@ -79,12 +258,11 @@ def main():
             campaign_data["created_by"] = st.text_input("Marketing Manager", placeholder="Your Name")
             campaign_data["platform"] = st.selectbox(
                 "Platform", 
-                ["Facebook", "Instagram", "Google Ads", "TikTok", "LinkedIn", "Twitter", "YouTube", "Other"]
+                PLATFORMS
             )
             campaign_data["campaign_objective"] = st.selectbox(
                 "Campaign Objective",
-                ["Brand Awareness", "Reach", "Traffic", "Engagement", "App Installs", 
-                 "Video Views", "Lead Generation", "Messages", "Conversions", "Catalog Sales"]
+                OBJECTIVES
             )
         
         with col2:
@@ -114,14 +292,14 @@ def main():
             # Gender
             targeting["gender"] = st.multiselect(
                 "Gender",
-                ["Male", "Female", "All"],
+                GENDERS,
                 default=["All"]
             )
             
             # Languages
             targeting["languages"] = st.multiselect(
                 "Languages",
-                ["English", "Spanish", "French", "German", "Chinese", "Japanese", "Other"],
+                LANGUAGES,
                 default=["English"]
             )
             
@@ -129,7 +307,7 @@ def main():
             st.subheader("Location")
             targeting["location_type"] = st.radio(
                 "Location Type",
-                ["Countries", "Regions", "Cities", "Radius", "Custom"]
+                LOCATION_TYPES
             )
             
             targeting["locations"] = st.text_area(
@@ -143,22 +321,20 @@ def main():
             # Interests
             targeting["interests"] = st.multiselect(
                 "Interests",
-                ["Technology", "Fashion", "Sports", "Gaming", "Travel", "Food & Drink", 
-                 "Entertainment", "Business", "Fitness", "Education", "Family", "Music"]
+                INTERESTS
             )
             
             # Behaviors
             targeting["behaviors"] = st.multiselect(
                 "Behaviors",
-                ["Frequent Travelers", "Online Shoppers", "Mobile Device Users", 
-                 "International", "Early Technology Adopters", "Small Business Owners"]
+                BEHAVIORS
             )
             
             # Device targeting
             st.subheader("Devices")
             targeting["devices"] = st.multiselect(
                 "Target Devices",
-                ["Desktop", "Mobile", "Tablet", "All"],
+                DEVICES,
                 default=["All"]
             )
             
@@ -183,35 +359,40 @@ def main():
         st.header("Generated Campaign ID")
         
         if st.button("Generate Campaign ID", type="primary"):
-            if not campaign_data.get("created_by") or not campaign_data.get("platform"):
-                st.error("Please fill in at least the Marketing Manager name and Platform in the Campaign Setup tab.")
+            if errors := validate_campaign_data(campaign_data):
+                st.error(f"Please fill in at least the {' and '.join(errors)} in the Campaign Setup tab.")
             else:
                 # Generate ID
-                campaign_id = generate_campaign_id(campaign_data)
+                campaign_id, creation_date = generate_campaign_id(campaign_data, datetime.datetime.now())
                 
                 # Save data
-                save_campaign_data(campaign_data, campaign_id)
+                save_campaign_data(campaign_data, campaign_id, creation_date)
                 
                 # Display the campaign ID
                 st.success("Campaign ID generated successfully!")
-                st.header(f"📋 {campaign_id}")
-                st.button("Copy to Clipboard", key="copy")
+                # st.code provides a built-in copy-to-clipboard control
+                st.code(campaign_id, language=None)
                 
                 # Display targeting summary
                 st.subheader("Campaign Summary")
                 
                 col1, col2 = st.columns(2)
                 
+                # One markdown element per column instead of one per line
                 with col1:
-                    st.write(f"**Platform:** {campaign_data['platform']}")
-                    st.write(f"**Objective:** {campaign_data['campaign_objective']}")
-                    st.write(f"**Created By:** {campaign_data['created_by']}")
-                    st.write(f"**Campaign Period:** {campaign_data['start_date']} to {campaign_data['end_date']}")
+                    st.markdown(
+                        f"**Platform:** {campaign_data['platform']}\n\n"
+                        f"**Objective:** {campaign_data['campaign_objective']}\n\n"
+                        f"**Created By:** {campaign_data['created_by']}\n\n"
+                        f"**Campaign Period:** {campaign_data['start_date']} to {campaign_data['end_date']}"
+                    )
                 
                 with col2:
-                    st.write(f"**Target Age:** {campaign_data['targeting']['age_range']}")
-                    st.write(f"**Target Gender:** {', '.join(campaign_data['targeting']['gender'])}")
-                    st.write(f"**Target Locations:** {campaign_data['targeting']['locations']}")
+                    st.markdown(
+                        f"**Target Age:** {campaign_data['targeting']['age_range']}\n\n"
+                        f"**Target Gender:** {', '.join(campaign_data['targeting']['gender'])}\n\n"
+                        f"**Target Locations:** {campaign_data['targeting']['locations']}"
+                    )
                 
                 # Export options
                 st.divider()
@@ -222,7 +403,7 @@ def main():
                 with export_col1:
                     st.download_button(
                         label="Download Campaign Data (JSON)",
-                        data=json.dumps(campaign_data, indent=2),
+                        data=export_campaign_json(campaign_data),
                         file_name=f"{campaign_id}_data.json",
                         mime="application/json"
                     )
@@ -234,26 +415,51 @@ def main():
     
     # Display campaign history in sidebar
     st.sidebar.title("Campaign History")
+    pending_count = len(get_pending()[0])
+    if pending_count:
+        st.sidebar.caption(f"{pending_count} new campaign(s) not yet written to history.")
     try:
-        history_df = pd.read_csv("campaign_records.csv")
-        st.sidebar.dataframe(
-            history_df[["campaign_id", "creation_date", "platform", "campaign_objective"]],
-            use_container_width=True
-        )
-        
-        # Search functionality
-        st.sidebar.divider()
-        st.sidebar.subheader("Search Campaigns")
-        search_term = st.sidebar.text_input("Search by ID or platform")
-        
-        if search_term:
-            filtered_df = history_df[
-                history_df["campaign_id"].str.contains(search_term, case=False) | 
-                history_df["platform"].str.contains(search_term, case=False)
-            ]
-            st.sidebar.dataframe(filtered_df, use_container_width=True)
-    except:
+        history_stat = os.stat(HISTORY_FILE)
+    except FileNotFoundError:
+        history_stat = None
+    # An empty file has no header yet, which pyarrow rejects as invalid CSV
+    if history_stat is None or history_stat.st_size == 0:
         st.sidebar.write("No campaign history available yet.")
+        return
+    history_table = load_history(history_stat.st_mtime)
+
+    st.sidebar.dataframe(
+        history_table,
+        use_container_width=True
+    )
+    
+    # Search functionality
+    st.sidebar.divider()
+    st.sidebar.subheader("Search Campaigns")
+    search_term = st.sidebar.text_input("Search by ID or platform")
+    
+    if search_term:
+        filtered_table = search_history(history_table, search_term)
+        st.sidebar.dataframe(filtered_table, use_container_width=True)
+
+def main():
+    """Main application function"""
+    # Reruns allocate many short-lived widget objects and few cycles, so skip
+    # cyclic GC pauses while any session is rendering. gc.disable() is
+    # interpreter-wide, so only the first render in disables it and only the
+    # last one out re-enables it.
+    state = get_render_gc_state()
+    with state["lock"]:
+        state["active"] += 1
+        if state["active"] == 1:
+            gc.disable()
+    try:
+        render_app()
+    finally:
+        with state["lock"]:
+            state["active"] -= 1
+            if state["active"] == 0:
+                gc.enable()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file